@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime
-from time import sleep
+from time import (
+    sleep,
+    time_ns,
+)
 from threading import (
-    Event,
     Lock,
+    local,
 )
+from weakref import finalize
 from typing import (
     TYPE_CHECKING,
     Generic,
@@ -13,8 +17,10 @@ from typing import (
 )
 
 if TYPE_CHECKING:
+    from datetime import tzinfo
     from typing import (
         Any,
+        List,
         Optional,
         Tuple,
         Type,
@@ -22,6 +28,7 @@ if TYPE_CHECKING:
     
 __all__: Tuple[str, ...] = (
     'SnowflakeGenerator',
+    'ThreadLocalSnowflakeGenerator',
 )
 
 _SnowflakeType = TypeVar(
@@ -34,17 +41,36 @@ process_id_bits: int = 2**5
 thread_id_bits: int = 2**5
 sequence_bits: int = 2**12
 snowflake_bits: int = 2**64
+sequence_mask: int = sequence_bits - 1
+max_run_ahead_ms: int = 5
 
 class SnowflakeGenerator(Generic[_SnowflakeType]):
+    __slots__ = (
+        '_lock',
+        '_closed',
+        '_epoch',
+        '_epoch_ms',
+        '_process_id',
+        '_thread_id',
+        '_static_bits',
+        '_step',
+        '_sequence',
+        '_last_ms',
+        '_last_tzinfo',
+    )
+
     if TYPE_CHECKING:
         _lock: Lock
-        _closed: Event
+        _closed: bool
         _epoch: datetime
+        _epoch_ms: int
         _process_id: int
         _thread_id: int
         _step: int
         _sequence: int
-        _last: datetime
+        _last_ms: int
+        _last_tzinfo: Optional[tzinfo]
+        _static_bits: int
         
     def __init__(
         self: SnowflakeGenerator,
@@ -56,12 +82,13 @@ class SnowflakeGenerator(Generic[_SnowflakeType]):
         last: datetime,
     ) -> None:
         self._lock = Lock()
-        self._closed = Event()
+        self._closed = False
         
         if not isinstance(epoch, datetime):
             raise TypeError(f'Invalid epoch (object is not instance of datetime): {type(epoch).__name__}')
 
         self._epoch = epoch
+        self._epoch_ms = int(epoch.timestamp() * 1000)
 
         if process_id >= process_id_bits:
             raise ValueError(f'Invalid process id value (process_id value greater than {process_id_bits - 1:,}): {process_id}')
@@ -72,6 +99,7 @@ class SnowflakeGenerator(Generic[_SnowflakeType]):
             raise ValueError(f'Invalid thread id value (thread_id value greater than {thread_id_bits - 1:,}): {thread_id}')
 
         self._thread_id = thread_id
+        self._static_bits = process_id << 17 | thread_id << 12
         
         if step < 1:
             raise ValueError(f'Invalid step value (step value less than 1): {step}')
@@ -87,17 +115,24 @@ class SnowflakeGenerator(Generic[_SnowflakeType]):
         self._sequence = sequence
 
         if last is None:
-            last = datetime.now()
+            self._last_ms = time_ns() // 1_000_000
+            self._last_tzinfo = None
 
-        if not isinstance(last, datetime):
+        elif not isinstance(last, datetime):
             raise TypeError(f'Invalid last (object is not instance of datetime): {type(last).__name__}')
 
-        self._last = last
+        else:
+            self._last_ms = int(last.timestamp() * 1000)
+            self._last_tzinfo = last.tzinfo
         
     @property
     def epoch(self: SnowflakeGenerator) -> datetime:
         return self._epoch
     
+    @property
+    def epoch_ms(self: SnowflakeGenerator) -> int:
+        return self._epoch_ms
+    
     @property
     def process_id(self: SnowflakeGenerator) -> int:
         return self._process_id
@@ -129,7 +164,7 @@ class SnowflakeGenerator(Generic[_SnowflakeType]):
     
     @property
     def last(self: SnowflakeGenerator) -> datetime:
-        return self._last
+        return datetime.fromtimestamp(self._last_ms / 1000, self._last_tzinfo)
     
     @last.setter
     def last(
@@ -142,13 +177,18 @@ class SnowflakeGenerator(Generic[_SnowflakeType]):
         if not isinstance(value, datetime):
             raise TypeError(f'Invalid last (object is not instance of datetime): {type(value).__name__}')
         
-        self._last = value
+        self._last_ms = int(value.timestamp() * 1000)
+        self._last_tzinfo = value.tzinfo
+    
+    @property
+    def last_ms(self: SnowflakeGenerator) -> int:
+        return self._last_ms
 
     def __iter__(self: SnowflakeGenerator) -> SnowflakeGenerator:
         return self
     
     def __next__(self: SnowflakeGenerator) -> _SnowflakeType:
-        if self.closed:
+        if self._closed:
             raise StopIteration('Cannot get next snowflake (snowflake generator is closed)')
 
         try:
@@ -160,53 +200,259 @@ class SnowflakeGenerator(Generic[_SnowflakeType]):
             raise StopIteration(f'Cannot get next snowflake ({e})')
     
     def generate(self: SnowflakeGenerator) -> _SnowflakeType:
-        if self.closed:
+        if self._closed:
             raise RuntimeError(f'Cannot generate snowflake (snowflake generator is closed)')
 
-        self._lock.acquire()
-
-        now: datetime
+        now_ms: int
         sequence: int
         
-        while True:
-            now = datetime.now()
-        
-            if self.last > now:
-                sleep((self.last - now).total_seconds())
-                continue
-        
-            if self.last == now:
-                sequence = (self.sequence + self.step) & (sequence_bits - 1)
-            
-                if sequence == 0:
-                    sleep(self.step / 1000)
-                    continue
+        with self._lock:
+            last_ms = self._last_ms
             
-            else:
-                sequence = 0
+            while True:
+                now_ms = time_ns() // 1_000_000
+                
+                if now_ms > last_ms:
+                    sequence = 0
+                    break
+                
+                sequence = (self._sequence + self._step) & sequence_mask
+                
+                if sequence != 0:
+                    now_ms = last_ms
+                    break
+                
+                if last_ms - now_ms < max_run_ahead_ms:
+                    now_ms = last_ms + 1
+                    break
+                
+                sleep((last_ms - now_ms - max_run_ahead_ms + 1) / 1000)
             
-            self.last = now
-            self.sequence = sequence
-        
-            break
+            self._last_ms = now_ms
+            self._sequence = sequence
         
         res = (
-            (int(now.timestamp() * 1000) - int(self.epoch.timestamp() * 1000)) << 22 |
-            self.process_id << 17 |
-            self.thread_id << 12 |
+            (now_ms - self._epoch_ms) << 22 |
+            self._static_bits |
             sequence
         )
         
-        self._lock.release()
-        
         if res >= snowflake_bits:
             raise ValueError(f'Invalid snowflake (snowflake value greater than {snowflake_bits - 1:,}): {res}')
         
         return res
     
+    def generate_batch(
+        self: SnowflakeGenerator,
+        count: int,
+    ) -> List[_SnowflakeType]:
+        if self._closed:
+            raise RuntimeError(f'Cannot generate snowflakes (snowflake generator is closed)')
+
+        if count < 1:
+            raise ValueError(f'Invalid count value (count value less than 1): {count}')
+
+        res: List[_SnowflakeType] = []
+        extend = res.extend
+        clock = time_ns
+        wait = sleep
+
+        now_ms: int
+        start: int
+        block: range
+
+        with self._lock:
+            epoch_ms = self._epoch_ms
+            static_bits = self._static_bits
+            step = self._step
+            last_ms = self._last_ms
+            sequence = self._sequence
+            remaining = count
+
+            while remaining:
+                now_ms = clock() // 1_000_000
+
+                if now_ms > last_ms:
+                    start = 0
+
+                else:
+                    start = (sequence + step) & sequence_mask
+
+                    if start != 0:
+                        now_ms = last_ms
+
+                    elif last_ms - now_ms < max_run_ahead_ms:
+                        now_ms = last_ms + 1
+
+                    else:
+                        wait((last_ms - now_ms - max_run_ahead_ms + 1) / 1000)
+                        continue
+
+                block = range(start, min(start + remaining * step, sequence_bits), step)
+                base = (now_ms - epoch_ms) << 22 | static_bits
+
+                extend([base | value for value in block])
+
+                remaining -= len(block)
+                last_ms = now_ms
+                sequence = block[-1]
+
+            self._last_ms = last_ms
+            self._sequence = sequence
+
+        if res[-1] >= snowflake_bits:
+            raise ValueError(f'Invalid snowflake (snowflake value greater than {snowflake_bits - 1:,}): {res[-1]}')
+
+        return res
+    
     def close(self: SnowflakeGenerator) -> None:
-        self._closed.set()
+        self._closed = True
         
     @property
     def closed(self: SnowflakeGenerator) -> bool:
-        return self._closed.is_set()
+        return self._closed
+
+
+class _ThreadOwner:
+    __slots__ = (
+        '__weakref__',
+    )
+
+
+class ThreadLocalSnowflakeGenerator(Generic[_SnowflakeType]):
+    __slots__ = (
+        '_lock',
+        '_closed',
+        '_local',
+        '_epoch',
+        '_process_id',
+        '_step',
+        '_generators',
+        '_free',
+    )
+
+    if TYPE_CHECKING:
+        _lock: Lock
+        _closed: bool
+        _local: local
+        _epoch: datetime
+        _process_id: int
+        _step: int
+        _generators: List[SnowflakeGenerator[_SnowflakeType]]
+        _free: List[SnowflakeGenerator[_SnowflakeType]]
+
+    def __init__(
+        self: ThreadLocalSnowflakeGenerator,
+        epoch: datetime,
+        process_id: int,
+        step: int,
+    ) -> None:
+        self._lock = Lock()
+        self._closed = False
+        self._local = local()
+
+        if not isinstance(epoch, datetime):
+            raise TypeError(f'Invalid epoch (object is not instance of datetime): {type(epoch).__name__}')
+
+        self._epoch = epoch
+
+        if process_id >= process_id_bits:
+            raise ValueError(f'Invalid process id value (process_id value greater than {process_id_bits - 1:,}): {process_id}')
+
+        self._process_id = process_id
+
+        if step < 1:
+            raise ValueError(f'Invalid step value (step value less than 1): {step}')
+        
+        if step >= sequence_bits:
+            raise ValueError(f'Invalid step value (step value greater than {sequence_bits - 1:,})): {step}')
+
+        self._step = step
+        self._generators = []
+        self._free = []
+
+    @property
+    def epoch(self: ThreadLocalSnowflakeGenerator) -> datetime:
+        return self._epoch
+    
+    @property
+    def process_id(self: ThreadLocalSnowflakeGenerator) -> int:
+        return self._process_id
+    
+    @property
+    def step(self: ThreadLocalSnowflakeGenerator) -> int:
+        return self._step
+
+    @property
+    def generator(self: ThreadLocalSnowflakeGenerator) -> SnowflakeGenerator[_SnowflakeType]:
+        try:
+            return self._local.generator
+        except AttributeError:
+            pass
+
+        with self._lock:
+            if self.closed:
+                raise RuntimeError(f'Cannot create snowflake generator (thread local snowflake generator is closed)')
+
+            if self._free:
+                generator = self._free.pop()
+
+            else:
+                thread_id = len(self._generators)
+
+                if thread_id >= thread_id_bits:
+                    raise RuntimeError(f'Cannot create snowflake generator (all {thread_id_bits:,} thread ids are in use)')
+
+                generator = SnowflakeGenerator(
+                    self._epoch,
+                    self._process_id,
+                    thread_id,
+                    self._step,
+                    0,
+                    None,
+                )
+
+                self._generators.append(generator)
+
+        owner = _ThreadOwner()
+        finalize(owner, self._free.append, generator)
+
+        self._local.generator = generator
+        self._local.owner = owner
+
+        return generator
+
+    def __iter__(self: ThreadLocalSnowflakeGenerator) -> ThreadLocalSnowflakeGenerator:
+        return self
+
+    def __next__(self: ThreadLocalSnowflakeGenerator) -> _SnowflakeType:
+        if self._closed:
+            raise StopIteration('Cannot get next snowflake (thread local snowflake generator is closed)')
+
+        try:
+            return self.generator.generate()
+        except (
+            RuntimeError,
+            ValueError,
+        ) as e:
+            raise StopIteration(f'Cannot get next snowflake ({e})')
+
+    def generate(self: ThreadLocalSnowflakeGenerator) -> _SnowflakeType:
+        return self.generator.generate()
+
+    def generate_batch(
+        self: ThreadLocalSnowflakeGenerator,
+        count: int,
+    ) -> List[_SnowflakeType]:
+        return self.generator.generate_batch(count)
+
+    def close(self: ThreadLocalSnowflakeGenerator) -> None:
+        with self._lock:
+            self._closed = True
+
+            for generator in self._generators:
+                generator.close()
+
+    @property
+    def closed(self: ThreadLocalSnowflakeGenerator) -> bool:
+        return self._closed
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import unittest
+from datetime import (
+    datetime,
+    timezone,
+)
+from threading import Thread
+from typing import TYPE_CHECKING
+from unittest import mock
+
+import pyflaker
+from pyflaker import (
+    SnowflakeGenerator,
+    ThreadLocalSnowflakeGenerator,
+)
+
+if TYPE_CHECKING:
+    from typing import List
+
+class FakeClock:
+    def __init__(
+        self: FakeClock,
+        now_ns: int,
+    ) -> None:
+        self.now_ns = now_ns
+
+    def time_ns(self: FakeClock) -> int:
+        return self.now_ns
+
+    def sleep(
+        self: FakeClock,
+        seconds: float,
+    ) -> None:
+        self.now_ns += round(seconds * 1_000_000_000)
+
+class SnowflakeGeneratorTest(unittest.TestCase):
+    def test_last_keeps_tzinfo(self: SnowflakeGeneratorTest) -> None:
+        last = datetime(2024, 1, 1, tzinfo = timezone.utc)
+        generator = SnowflakeGenerator(datetime(2020, 1, 1), 1, 2, 1, 0, last)
+
+        self.assertEqual(generator.last, last)
+        self.assertIs(generator.last.tzinfo, timezone.utc)
+
+        generator.last = datetime(2024, 1, 2)
+
+        self.assertIsNone(generator.last.tzinfo)
+
+class GenerateBatchTest(unittest.TestCase):
+    epoch: datetime = datetime(2020, 1, 1)
+    start_ns: int = 1_700_000_000_000_000_000
+
+    def _run(
+        self: GenerateBatchTest,
+        step: int,
+        sequence: int,
+        count: int,
+        batch: bool,
+    ) -> List[int]:
+        clock = FakeClock(self.start_ns)
+
+        with (
+            mock.patch.object(pyflaker, 'time_ns', clock.time_ns),
+            mock.patch.object(pyflaker, 'sleep', clock.sleep),
+        ):
+            generator = SnowflakeGenerator(self.epoch, 1, 2, step, sequence, None)
+
+            if batch:
+                res = generator.generate_batch(count)
+            else:
+                res = [generator.generate() for _ in range(count)]
+
+            self.assertLessEqual(
+                generator.last_ms - clock.now_ns // 1_000_000,
+                pyflaker.max_run_ahead_ms,
+            )
+
+        return res
+
+    def test_batch_matches_generate(self: GenerateBatchTest) -> None:
+        for step in (1, 3, 6, 2048, 4095):
+            for sequence in (0, 7 * step & pyflaker.sequence_mask):
+                with self.subTest(step = step, sequence = sequence):
+                    expected = self._run(step, sequence, 50_000, False)
+                    actual = self._run(step, sequence, 50_000, True)
+
+                    self.assertEqual(actual, expected)
+                    self.assertEqual(len(set(actual)), len(actual))
+
+class ThreadLocalSnowflakeGeneratorTest(unittest.TestCase):
+    def test_thread_ids_are_reused(self: ThreadLocalSnowflakeGeneratorTest) -> None:
+        generator = ThreadLocalSnowflakeGenerator(datetime(2020, 1, 1), 1, 1)
+        res: List[int] = []
+
+        def work() -> None:
+            res.extend(generator.generate_batch(1_000))
+
+        for _ in range(pyflaker.thread_id_bits + 10):
+            thread = Thread(target = work)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(len(res), (pyflaker.thread_id_bits + 10) * 1_000)
+        self.assertEqual(len(set(res)), len(res))
+
+if __name__ == '__main__':
+    unittest.main()